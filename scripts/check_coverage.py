@@ -1,13 +1,113 @@
 #!/usr/bin/env python3
 
+import re
 import json
+import mmap
 import argparse
+from operator import countOf
 
+try:
+    # ijson picks the fastest available backend (yajl2_c when installed)
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Istanbul writes each file's statement hit counts as a flat object such as
+# "s":{"0":1,"1":0}, which can be picked out of the raw report bytes
+STATEMENT_MAP_RE = re.compile(rb'"statementMap"\s*:')
+STATEMENT_COUNTS_RE = re.compile(rb'"s"\s*:\s*\{([^{}]*)\}')
+HIT_COUNT_RE = re.compile(rb'"\d+"\s*:\s*(\d+)')
+REPORT_END_RE = re.compile(rb'\}\s*\}\s*\Z')
+
+
+def count_statements_fast(file_path):
+    total_statements = 0
+    covered_statements = 0
+
+    try:
+        with open(file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # A cut-off report has to fail like it would in a real parser,
+            # so the data must open as an object and end by closing the last
+            # file entry and the report itself
+            if (not data[:64].lstrip().startswith(b'{')
+                    or not REPORT_END_RE.search(data[-64:])):
+                return None
+
+            blocks = STATEMENT_COUNTS_RE.findall(data)
+
+            # Every file entry has exactly one statement map; if the count
+            # blocks found don't line up with them, leave it to a real parser
+            if len(blocks) != len(STATEMENT_MAP_RE.findall(data)):
+                return None
+    except (OSError, ValueError):
+        # Empty files and non-mappable inputs such as pipes or /dev/stdin
+        # can't be memory-mapped
+        return None
+
+    for block in blocks:
+        counts = HIT_COUNT_RE.findall(block)
+        if len(counts) != block.count(b':'):
+            return None
+        total_statements += len(counts)
+        covered_statements += len(counts) - countOf(counts, b'0')
+
+    return total_statements, covered_statements
+
+
+def count_statements_streaming(file_path):
+    total_statements = 0
+    covered_statements = 0
+    file_key = None
+    statements_prefix = None
+    has_statements = False
+
+    # Walk the parser events so the report is never loaded as a whole. Top
+    # level keys are source file names, and the statement counts are the
+    # numbers found directly under "<file>.s".
+    with open(file_path, 'rb') as file:
+        for prefix, event, value in ijson.parse(file):
+            if event == 'map_key' and prefix == '':
+                file_key = value
+                statements_prefix = f'{value}.s.'
+                has_statements = False
+            elif event == 'map_key' and prefix == file_key and value == 's':
+                has_statements = True
+            elif event == 'end_map' and prefix == file_key:
+                # Fail on a file entry without statement counts, the same
+                # way indexing file_coverage['s'] does
+                if not has_statements:
+                    raise KeyError('s')
+            elif (event == 'number' and statements_prefix is not None
+                  and prefix.startswith(statements_prefix)
+                  and '.' not in prefix[len(statements_prefix):]):
+                total_statements += 1
+                if value > 0:
+                    covered_statements += 1
+
+    return total_statements, covered_statements
+
+
+def count_statements(file_path):
+    counts = count_statements_fast(file_path)
+    if counts is not None:
+        return counts
+
+    if ijson is not None:
+        return count_statements_streaming(file_path)
 
-def check_coverage(file_path):
     # Open and read the coverage data from the JSON file
-    with open(file_path, 'r') as file:
-        coverage_data = json.load(file)
+    if orjson is not None:
+        with open(file_path, 'rb') as file:
+            coverage_data = orjson.loads(file.read())
+    else:
+        with open(file_path, 'r') as file:
+            coverage_data = json.load(file)
 
     total_statements = 0
     covered_statements = 0
@@ -16,8 +116,15 @@ def check_coverage(file_path):
     for file_coverage in coverage_data.values():
         statements = file_coverage['s']
         total_statements += len(statements)
-        covered_statements += sum(1 for count in statements.values()
-                                  if count > 0)
+        # Hit counts are never negative, so counting the zeros in C is
+        # enough to know how many statements were covered
+        covered_statements += len(statements) - countOf(statements.values(), 0)
+
+    return total_statements, covered_statements
+
+
+def check_coverage(file_path):
+    total_statements, covered_statements = count_statements(file_path)
 
     # Calculate the coverage percentage
     coverage_percentage = (covered_statements / total_statements) * 100
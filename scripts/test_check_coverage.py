@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import check_coverage
+from check_coverage import (count_statements, count_statements_fast,
+                            count_statements_streaming)
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'test_coverage_final.json')
+
+
+def count_statements_reference(file_path):
+    # Plain json.load count that the faster paths have to agree with
+    with open(file_path, 'r') as file:
+        coverage_data = json.load(file)
+
+    total_statements = 0
+    covered_statements = 0
+    for file_coverage in coverage_data.values():
+        for count in file_coverage['s'].values():
+            total_statements += 1
+            if count > 0:
+                covered_statements += 1
+
+    return total_statements, covered_statements
+
+
+def write_report(directory, coverage_data):
+    report_path = os.path.join(directory, 'coverage-final.json')
+    with open(report_path, 'w') as file:
+        json.dump(coverage_data, file)
+    return report_path
+
+
+class CheckCoverageTest(unittest.TestCase):
+    def test_fast_path_matches_json_load(self):
+        expected = count_statements_reference(FIXTURE_PATH)
+        self.assertEqual(expected, (8, 6))
+        self.assertEqual(count_statements_fast(FIXTURE_PATH), expected)
+        self.assertEqual(count_statements(FIXTURE_PATH), expected)
+
+    def open_fixture_pipe(self):
+        read_fd, write_fd = os.pipe()
+        with open(FIXTURE_PATH, 'rb') as fixture:
+            os.write(write_fd, fixture.read())
+        os.close(write_fd)
+        self.addCleanup(os.close, read_fd)
+        return f'/dev/fd/{read_fd}'
+
+    def test_fast_path_skips_pipe(self):
+        self.assertIsNone(count_statements_fast(self.open_fixture_pipe()))
+
+    def test_fast_path_skips_truncated_report(self):
+        with open(FIXTURE_PATH, 'rb') as fixture:
+            report = fixture.read()
+
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = os.path.join(directory, 'coverage-final.json')
+            with open(report_path, 'wb') as file:
+                file.write(report[:-1])
+            self.assertIsNone(count_statements_fast(report_path))
+            with self.assertRaises(Exception):
+                count_statements(report_path)
+
+    @unittest.skipUnless(check_coverage.ijson, 'ijson is not installed')
+    def test_pipe_falls_back_to_ijson(self):
+        pipe_path = self.open_fixture_pipe()
+        with mock.patch.object(check_coverage, 'count_statements_streaming',
+                               wraps=count_statements_streaming) as streaming:
+            self.assertEqual(count_statements(pipe_path),
+                             count_statements_reference(FIXTURE_PATH))
+        streaming.assert_called_once_with(pipe_path)
+
+    @unittest.skipUnless(check_coverage.orjson, 'orjson is not installed')
+    def test_pipe_falls_back_to_orjson(self):
+        pipe_path = self.open_fixture_pipe()
+        orjson = mock.Mock(wraps=check_coverage.orjson)
+        with mock.patch.object(check_coverage, 'ijson', None), \
+                mock.patch.object(check_coverage, 'orjson', orjson):
+            self.assertEqual(count_statements(pipe_path),
+                             count_statements_reference(FIXTURE_PATH))
+        orjson.loads.assert_called_once()
+
+    def test_pipe_falls_back_to_json(self):
+        pipe_path = self.open_fixture_pipe()
+        expected = count_statements_reference(FIXTURE_PATH)
+        with mock.patch.object(check_coverage, 'ijson', None), \
+                mock.patch.object(check_coverage, 'orjson', None), \
+                mock.patch.object(check_coverage.json, 'load',
+                                  wraps=json.load) as load:
+            self.assertEqual(count_statements(pipe_path), expected)
+        load.assert_called_once()
+
+    @unittest.skipUnless(check_coverage.ijson, 'ijson is not installed')
+    def test_streaming_matches_json_load(self):
+        self.assertEqual(count_statements_streaming(FIXTURE_PATH),
+                         count_statements_reference(FIXTURE_PATH))
+
+    @unittest.skipUnless(check_coverage.ijson, 'ijson is not installed')
+    def test_streaming_dotted_file_paths(self):
+        coverage_data = {
+            '/src/lib.s.js': {'s': {'0': 1, '1': 0}, 'f': {'0': 4}},
+            '/src/lib.s.js.s': {'s': {'0': 0}, 'b': {'0': [1, 2]}},
+            '/src/a.s.0/index.js': {'s': {'0': 2, '1': 3, '2': 1}},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = write_report(directory, coverage_data)
+            self.assertEqual(count_statements_streaming(report_path), (6, 4))
+            self.assertEqual(count_statements_streaming(report_path),
+                             count_statements_reference(report_path))
+
+    @unittest.skipUnless(check_coverage.ijson, 'ijson is not installed')
+    def test_streaming_missing_statements_fails(self):
+        coverage_data = {
+            '/src/index.js': {'s': {'0': 1}},
+            '/src/main.js': {'f': {'0': 1}},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = write_report(directory, coverage_data)
+            with self.assertRaises(KeyError):
+                count_statements_reference(report_path)
+            with self.assertRaises(KeyError):
+                count_statements_streaming(report_path)
+
+
+if __name__ == "__main__":
+    unittest.main()